@@ -1,19 +1,107 @@
 #!/usr/bin/env python
 # coding: utf-8
 
+import sys
+import os
+import time
+
+class ImportTimer:
+    """统计启动阶段各模块的导入耗时（命令行加 --import-report 或设置环境变量 BELEMEH_IMPORT_REPORT=1 开启）"""
+    def __init__(self):
+        import builtins
+        self._builtins = builtins
+        self._original_import = builtins.__import__
+        self._depth = 0
+        self.records = []  # 按导入开始顺序排列的 (嵌套深度, 模块名, 耗时秒)
+        self.start = time.perf_counter()
+    
+    def install(self):
+        self._builtins.__import__ = self._timed_import
+    
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # 只统计首次导入，已加载的模块直接走原始导入
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        index = len(self.records)
+        self.records.append(None)
+        self._depth += 1
+        t0 = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._depth -= 1
+            self.records[index] = (self._depth, name, time.perf_counter() - t0)
+    
+    def report(self, title="导入耗时"):
+        """打印导入耗时明细（缩进表示嵌套导入，耗时包含子模块）"""
+        print(f"===== {title}（距启动 {(time.perf_counter() - self.start) * 1000:.1f} ms）=====")
+        for depth, name, elapsed in (r for r in self.records if r):
+            if elapsed >= 0.001:
+                print(f"{'  ' * depth}{name}: {elapsed * 1000:.1f} ms")
+        total = sum(r[2] for r in self.records if r and r[0] == 0)
+        print(f"顶层导入合计: {total * 1000:.1f} ms")
+
+import_timer = None
+if '--import-report' in sys.argv or os.environ.get('BELEMEH_IMPORT_REPORT'):
+    import_timer = ImportTimer()
+    import_timer.install()
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from collections import deque
-import sys
-import os
 import json
 import hashlib
+import queue
+import threading
+import zlib
 
-# 延迟导入pandas，只在需要时加载
-try:
-    import pandas as pd
-except ImportError:
-    pd = None
+# 延迟导入pandas，只在第一次读写Excel时加载（txt词库完全不需要pandas）
+pd = None
+
+def get_pandas():
+    """按需导入pandas"""
+    global pd
+    if pd is None:
+        import pandas
+        pd = pandas
+        if import_timer:
+            import_timer.report("导入pandas后")
+    return pd
+
+# 源文件指纹缓存：(路径, 大小, mtime_ns, inode) -> 指纹，元数据不变就不再重新读文件
+_fingerprint_cache = {}
+_fingerprint_lock = threading.Lock()  # 后台保存线程和界面线程都会访问缓存
+_FINGERPRINT_PREFIX = "crc32:"
+_HASH_BUFFER_SIZE = 1024 * 1024  # 1MB读缓冲
+SESSION_HEAD_SIZE = 20  # 启动快照中保存的队首单词数
+LOAD_POLL_MS = 50  # 后台加载完整词库时，界面线程检查是否加载完成的间隔（毫秒）
+
+def get_file_fingerprint(filename):
+    """计算文件指纹（CRC32，非加密哈希），按文件元数据缓存结果"""
+    st = os.stat(filename)
+    key = (os.path.abspath(filename), st.st_size, st.st_mtime_ns, st.st_ino)
+    with _fingerprint_lock:
+        fingerprint = _fingerprint_cache.get(key)
+    if fingerprint is not None:
+        return fingerprint
+    
+    crc = 0
+    buf = bytearray(_HASH_BUFFER_SIZE)
+    view = memoryview(buf)
+    with open(filename, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            crc = zlib.crc32(view[:n], crc)
+    fingerprint = f"{_FINGERPRINT_PREFIX}{st.st_size:x}-{crc:08x}"
+    
+    # 同一路径只保留最新的一条缓存
+    with _fingerprint_lock:
+        for old_key in [k for k in _fingerprint_cache if k[0] == key[0]]:
+            del _fingerprint_cache[old_key]
+        _fingerprint_cache[key] = fingerprint
+    return fingerprint
 
 class Vocabulary:
     def __init__(self, word, definition, tag="", learned=False):
@@ -46,12 +134,17 @@ class VocabularyTrainer:
         self.b = b  # M选项插入位置
         self.filename = ""  # 当前加载的文件名
         self.progress_file = ""  # 进度文件名
+        self.session_file = ""   # 启动快照文件名（只存队首几个单词，用于快速恢复界面）
         self.previous_word = None  # 存储上一个单词
         self.current_word = None   # 存储当前单词
         self.next_word = None      # 存储下一个单词
     
     def get_file_hash(self, filename):
-        """计算文件的哈希值，用于识别文件是否改变"""
+        """计算文件的指纹，用于识别文件是否改变（带缓存，文件未变时不重新读取）"""
+        return get_file_fingerprint(filename)
+    
+    def get_legacy_file_hash(self, filename):
+        """计算文件的MD5（旧版进度文件使用的格式）"""
         hash_md5 = hashlib.md5()
         with open(filename, "rb") as f:
             for chunk in iter(lambda: f.read(4096), b""):
@@ -59,40 +152,41 @@ class VocabularyTrainer:
         return hash_md5.hexdigest()
     
     def load_from_file(self, filename):
-        """从文件加载单词"""
+        """从文件加载单词（读取失败时弹窗提示并退出）"""
+        try:
+            self.read_from_file(filename)
+        except Exception as e:
+            show_load_error(filename, e)
+    
+    def read_from_file(self, filename):
+        """从文件加载单词，读取失败时抛出异常（不操作界面，可以在工作线程中调用）"""
         self.filename = filename
         self.progress_file = os.path.splitext(filename)[0] + ".progress"
+        self.session_file = os.path.splitext(filename)[0] + ".session"
         
         # 尝试加载进度文件
         if self.load_progress():
             return  # 成功加载进度，直接返回
         
         # 没有进度文件或文件已改变，从原始文件加载
-        try:
-            # 检查文件扩展名
-            if filename.endswith('.xlsx') or filename.endswith('.xls'):
-                # 读取Excel文件
-                df = pd.read_excel(filename)
-                # 假设第一列是单词，第二列是释义
-                for _, row in df.iterrows():
-                    word = str(row[0])
-                    definition = str(row[1]) if len(row) > 1 else ""
-                    self.to_learn.append(Vocabulary(word, definition, tag=""))
-            else:
-                # 文本文件格式
-                with open(filename, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        parts = line.strip().split('\t')
-                        if len(parts) >= 1:
-                            word = parts[0]
-                            definition = '\t'.join(parts[1:]) if len(parts) > 1 else ""
-                            self.to_learn.append(Vocabulary(word, definition, tag=""))
-        except FileNotFoundError:
-            messagebox.showerror("错误", f"文件 {filename} 未找到")
-            sys.exit(1)
-        except Exception as e:
-            messagebox.showerror("错误", f"读取文件时出错: {e}")
-            sys.exit(1)
+        # 检查文件扩展名
+        if filename.endswith('.xlsx') or filename.endswith('.xls'):
+            # 读取Excel文件
+            df = get_pandas().read_excel(filename)
+            # 假设第一列是单词，第二列是释义
+            for _, row in df.iterrows():
+                word = str(row[0])
+                definition = str(row[1]) if len(row) > 1 else ""
+                self.to_learn.append(Vocabulary(word, definition, tag=""))
+        else:
+            # 文本文件格式
+            with open(filename, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.strip().split('\t')
+                    if len(parts) >= 1:
+                        word = parts[0]
+                        definition = '\t'.join(parts[1:]) if len(parts) > 1 else ""
+                        self.to_learn.append(Vocabulary(word, definition, tag=""))
     
     def load_progress(self):
         """尝试加载进度文件"""
@@ -103,8 +197,13 @@ class VocabularyTrainer:
             with open(self.progress_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 
-                # 检查文件是否改变
-                if data.get('file_hash') != self.get_file_hash(self.filename):
+                # 检查文件是否改变（旧版进度文件保存的是MD5，按旧方式校验）
+                saved_hash = data.get('file_hash') or ''
+                if saved_hash.startswith(_FINGERPRINT_PREFIX):
+                    current_hash = self.get_file_hash(self.filename)
+                else:
+                    current_hash = self.get_legacy_file_hash(self.filename)
+                if saved_hash != current_hash:
                     return False  # 文件已改变，需要重新加载
                 
                 # 加载参数
@@ -126,22 +225,101 @@ class VocabularyTrainer:
             print(f"加载进度文件失败: {e}")
             return False
     
+    def snapshot_progress(self):
+        """在主线程上快速拍下当前进度快照（只复制字段，不做哈希和序列化）"""
+        return {
+            'filename': self.filename,
+            'progress_file': self.progress_file,
+            'session_file': self.session_file,
+            'a': self.a,
+            'b': self.b,
+            'to_learn': [(w.word, w.definition, w.tag, w.learned) for w in self.to_learn],
+            'learned': [(w.word, w.definition, w.tag, w.learned) for w in self.learned]
+        }
+    
+    def write_progress(self, snapshot):
+        """把快照写入进度文件（先写临时文件再原子替换，避免写一半时崩溃损坏进度）"""
+        progress_file = snapshot['progress_file']
+        if not progress_file:
+            return
+        
+        keys = ('word', 'definition', 'tag', 'learned')
+        data = {
+            'file_hash': self.get_file_hash(snapshot['filename']),
+            'a': snapshot['a'],
+            'b': snapshot['b'],
+            'to_learn': [dict(zip(keys, item)) for item in snapshot['to_learn']],
+            'learned': [dict(zip(keys, item)) for item in snapshot['learned']]
+        }
+        
+        tmp_file = progress_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, progress_file)
+        
+        self.write_session_snapshot(snapshot)
+    
+    def write_session_snapshot(self, snapshot):
+        """写入启动快照：参数、队首若干单词、队列长度，以及源文件和进度文件的元数据"""
+        session_file = snapshot.get('session_file')
+        if not session_file:
+            return
+        
+        source_stat = os.stat(snapshot['filename'])
+        progress_stat = os.stat(snapshot['progress_file'])
+        data = {
+            'source': [source_stat.st_size, source_stat.st_mtime_ns],
+            'progress': [progress_stat.st_size, progress_stat.st_mtime_ns],
+            'a': snapshot['a'],
+            'b': snapshot['b'],
+            'to_learn_count': len(snapshot['to_learn']),
+            'learned_count': len(snapshot['learned']),
+            'head': [list(item) for item in snapshot['to_learn'][:SESSION_HEAD_SIZE]]
+        }
+        
+        tmp_file = session_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_file, session_file)
+    
+    @classmethod
+    def load_session_snapshot(cls, filename):
+        """从启动快照恢复一个只含队首单词的临时训练器。
+        
+        只比较源文件和进度文件的大小与修改时间，不读取词库本身；快照过期或不存在时返回None。
+        临时训练器没有进度文件名，因此不会被保存，完整词库加载后即被替换。
+        """
+        session_file = os.path.splitext(filename)[0] + ".session"
+        progress_file = os.path.splitext(filename)[0] + ".progress"
+        try:
+            with open(session_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            source_stat = os.stat(filename)
+            progress_stat = os.stat(progress_file)
+            if data['source'] != [source_stat.st_size, source_stat.st_mtime_ns]:
+                return None
+            if data['progress'] != [progress_stat.st_size, progress_stat.st_mtime_ns]:
+                return None
+            
+            trainer = cls(a=data['a'], b=data['b'])
+            trainer.filename = filename
+            for word, definition, tag, learned in data['head']:
+                trainer.to_learn.append(Vocabulary(word, definition, tag, learned))
+            trainer.to_learn_count = data['to_learn_count']
+            trainer.learned_count = data['learned_count']
+            return trainer
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
     def save_progress(self):
-        """保存当前进度到文件"""
+        """保存当前进度到文件（同步版本）"""
         if not self.progress_file:
             return
         
         try:
-            data = {
-                'file_hash': self.get_file_hash(self.filename),
-                'a': self.a,
-                'b': self.b,
-                'to_learn': [word.to_dict() for word in self.to_learn],
-                'learned': [word.to_dict() for word in self.learned]
-            }
-            
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self.write_progress(self.snapshot_progress())
         except Exception as e:
             print(f"保存进度文件失败: {e}")
     
@@ -305,6 +483,7 @@ class VocabularyTrainer:
             # 检查文件扩展名
             if self.filename.endswith('.xlsx') or self.filename.endswith('.xls'):
                 # 读取Excel文件
+                pd = get_pandas()
                 df = pd.read_excel(self.filename)
                 
                 if is_new:
@@ -395,10 +574,84 @@ class VocabularyTrainer:
         self.learned.append(word_obj)
         return word_obj, f"单词 '{word_obj.word}' 已直接移入已学习队列"
 
+def show_load_error(filename, error):
+    """词库读取失败：弹窗提示后退出（只能在界面线程中调用）"""
+    if isinstance(error, FileNotFoundError):
+        messagebox.showerror("错误", f"文件 {filename} 未找到")
+    else:
+        messagebox.showerror("错误", f"读取文件时出错: {error}")
+    sys.exit(1)
+
+class ProgressSaver:
+    """后台保存线程：界面只负责拍快照，哈希和写文件都放到工作线程里做。
+    
+    连续多次保存请求只保留最新的一份快照（合并），所以点击再快也只会排队一次写入。
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = None   # (trainer, snapshot)，尚未写入的最新快照
+        self._writing = False  # 工作线程是否正在写文件
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="ProgressSaver", daemon=True)
+        self._thread.start()
+    
+    def request_save(self, trainer):
+        """请求保存进度：在调用线程上拍快照，覆盖尚未写入的旧快照"""
+        if not trainer.progress_file:
+            return
+        snapshot = trainer.snapshot_progress()
+        with self._cond:
+            if self._closed:
+                return
+            self._pending = (trainer, snapshot)
+            self._cond.notify_all()
+    
+    def flush(self):
+        """等待所有已请求的保存写入磁盘"""
+        with self._cond:
+            while self._pending is not None or self._writing:
+                self._cond.wait()
+    
+    def discard(self):
+        """丢弃尚未写入的快照并等待当前写入结束（如重置进度前调用）"""
+        with self._cond:
+            self._pending = None
+            while self._writing:
+                self._cond.wait()
+    
+    def close(self):
+        """写完剩余的快照后停止工作线程"""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                trainer, snapshot = self._pending
+                self._pending = None
+                self._writing = True
+            
+            try:
+                trainer.write_progress(snapshot)
+            except Exception as e:
+                print(f"保存进度文件失败: {e}")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
 class VocabularyTrainerGUI:
     def __init__(self, root, trainer):
         self.root = root
         self.trainer = trainer
+        self.saver = ProgressSaver()  # 后台保存进度，避免大文件时界面卡顿
         self.current_word = None
         self.choice_made = False  # 标记用户是否已做出选择
         
@@ -726,6 +979,54 @@ class VocabularyTrainerGUI:
         # 开始显示第一个单词
         self.show_next_word()
     
+    def start_loading(self, filename):
+        """界面已用启动快照显示出来后，再加载完整词库"""
+        for widget in (self.low_button, self.medium_button, self.high_button, self.master_button,
+                       self.next_button, self.prev_button, self.edit_word_button, self.add_word_button,
+                       self.reset_button, self.a_spinbox, self.b_spinbox):
+            widget.config(state=tk.DISABLED)
+        self.status_label.config(
+            text=f"正在加载完整词库... 待学习: {self.trainer.to_learn_count} | 已学习: {self.trainer.learned_count}"
+        )
+        # 和保存进度一样，读文件、解析词库放到工作线程里，界面线程只定时取回结果（Tk 只能在界面线程中调用）
+        self.loaded = queue.SimpleQueue()
+        threading.Thread(target=self.load_full_deck, args=(filename,), name="DeckLoader", daemon=True).start()
+        self.root.after(LOAD_POLL_MS, lambda: self.finish_loading(filename))
+    
+    def load_full_deck(self, filename):
+        """工作线程：解析完整词库，把 (训练器, 异常) 交给界面线程"""
+        trainer = VocabularyTrainer(a=10, b=15)
+        try:
+            trainer.read_from_file(filename)
+        except Exception as e:
+            self.loaded.put((None, e))
+        else:
+            self.loaded.put((trainer, None))
+    
+    def finish_loading(self, filename):
+        """用完整词库替换启动快照中的临时训练器；工作线程还没加载完时稍后再检查"""
+        try:
+            trainer, error = self.loaded.get_nowait()
+        except queue.Empty:
+            self.root.after(LOAD_POLL_MS, lambda: self.finish_loading(filename))
+            return
+        if error is not None:
+            show_load_error(filename, error)
+        self.trainer = trainer
+        
+        for widget in (self.add_word_button, self.reset_button, self.a_spinbox, self.b_spinbox):
+            widget.config(state=tk.NORMAL)
+        self.a_var.set(self.trainer.a)
+        self.b_var.set(self.trainer.b)
+        
+        # 完整队列的队首就是快照里正在显示的单词，重新取一次即可
+        self.current_word = None
+        self.choice_made = False
+        self.show_next_word()
+        
+        if import_timer:
+            import_timer.report("完整词库加载后")
+    
     def update_params(self):
         """更新a和b参数"""
         try:
@@ -740,7 +1041,7 @@ class VocabularyTrainerGUI:
             self.trainer.b = b_val
             
             # 保存进度
-            self.trainer.save_progress()
+            self.saver.request_save(self.trainer)
             
             self.status_label.config(text=f"参数已更新: L位置={a_val}, M位置={b_val}")
         except ValueError:
@@ -775,7 +1076,7 @@ class VocabularyTrainerGUI:
         self.prev_button.config(state=tk.DISABLED)   # 禁用"上一个"按钮
         
         # 保存进度
-        self.trainer.save_progress()
+        self.saver.request_save(self.trainer)
     
     def show_next_word(self):
         """显示下一个单词"""
@@ -815,7 +1116,7 @@ class VocabularyTrainerGUI:
         self.update_status()
         
         # 保存进度
-        self.trainer.save_progress()
+        self.saver.request_save(self.trainer)
     
     def show_previous_word(self):
         """显示上一个单词"""
@@ -857,7 +1158,7 @@ class VocabularyTrainerGUI:
         self.update_status()
         
         # 保存进度
-        self.trainer.save_progress()
+        self.saver.request_save(self.trainer)
     
     def update_status(self):
         """更新状态信息"""
@@ -902,7 +1203,7 @@ class VocabularyTrainerGUI:
         self.edit_word_button.config(state=tk.NORMAL)  # 禁用编辑按钮（因为已经做出选择）改成启用
         
         # 保存进度
-        self.trainer.save_progress()
+        self.saver.request_save(self.trainer)
     
     def calculate_position_info(self, choice):
         """计算并返回单词将进入的位置信息"""
@@ -955,11 +1256,14 @@ class VocabularyTrainerGUI:
         self.edit_word_button.config(state=tk.DISABLED)
         
         # 保存进度
-        self.trainer.save_progress()
+        self.saver.request_save(self.trainer)
     
     def reset_progress(self):
         """重置学习进度"""
         if messagebox.askyesno("确认", "确定要重置学习进度吗？这将删除所有保存的数据并重新开始。"):
+            # 丢弃尚未写入的旧进度，避免删除后又被后台线程写回
+            self.saver.discard()
+            
             # 删除进度文件
             if os.path.exists(self.trainer.progress_file):
                 try:
@@ -1036,7 +1340,7 @@ class VocabularyTrainerGUI:
             self.update_status()
             
             # 保存进度
-            self.trainer.save_progress()
+            self.saver.request_save(self.trainer)
             
             # 如果当前没有单词在显示，立即显示新单词
             if not self.trainer.to_learn or self.trainer.to_learn[0] == new_word:
@@ -1149,7 +1453,7 @@ class VocabularyTrainerGUI:
                 self.update_status()
                 
                 # 保存进度
-                self.trainer.save_progress()
+                self.saver.request_save(self.trainer)
             else:
                 messagebox.showerror("错误", f"编辑单词失败: {message}")
             
@@ -1188,8 +1492,9 @@ class VocabularyTrainerGUI:
     
     def on_closing(self):
         """窗口关闭事件处理"""
-        # 保存进度
-        self.trainer.save_progress()
+        # 保存进度，并等待后台线程把剩余快照写入磁盘
+        self.saver.request_save(self.trainer)
+        self.saver.close()
         self.root.destroy()
     
     def exit_program(self):
@@ -1212,9 +1517,13 @@ if __name__ == "__main__":
         print("未选择文件，程序退出")
         sys.exit(0)
     
-    # 创建训练器并加载文件
-    trainer = VocabularyTrainer(a=10, b=15)
-    trainer.load_from_file(filename)
+    # 优先用启动快照立即显示上次的单词，完整词库在窗口出现后再加载
+    trainer = VocabularyTrainer.load_session_snapshot(filename)
+    warm_start = trainer is not None
+    if not warm_start:
+        # 创建训练器并加载文件
+        trainer = VocabularyTrainer(a=10, b=15)
+        trainer.load_from_file(filename)
     
     # 销毁临时隐藏的根窗口
     root.destroy()
@@ -1222,4 +1531,9 @@ if __name__ == "__main__":
     # 创建新的主GUI窗口
     root = tk.Tk()
     app = VocabularyTrainerGUI(root, trainer)
+    if warm_start:
+        app.start_loading(filename)
+    
+    if import_timer:
+        import_timer.report("界面显示前")
     root.mainloop()
\ No newline at end of file
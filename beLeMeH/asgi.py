@@ -0,0 +1,309 @@
+# coding: utf-8
+"""ASGI入口：训练器JSON接口走异步事件循环，其余页面交给原Flask应用
+
+启动（需要 uvicorn）：
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+
+- /process_choice、/next_word 等训练器接口直接在事件循环里解析请求，
+  登录校验（经 Flask-Login，与Flask页面相同）和训练器操作（含SQLite写入、词库文件解析）放到有界线程池中执行，
+  空闲的长连接不再占用同步worker。
+- /ws/trainer 是学习会话的 WebSocket 通道：连接时校验 Origin（必须与 Host 相同或在 ASGI_ALLOWED_ORIGINS 中，
+  防止其他网站借用户的Cookie建立连接）和会话Cookie，之后答题请求从同一连接发来，
+  积压的多条请求合并为一批执行（一次加锁、一次写库），结果和最新状态（状态栏、队首单词）推送回客户端。
+  每批执行前重新校验会话；用户在本进程登出时关闭该用户的所有连接。
+  消息格式：客户端发送 {"id": 1, "action": "process_choice", "data": {"choice": "L"}}，
+  服务端回复 {"type": "result", "id": 1, ...与HTTP接口相同的字段} 和 {"type": "state", "status": ..., "next_word": ...}。
+- 登录、上传、文件管理等页面仍由Flask处理（通过 asgiref 的 WsgiToAsgi 适配）。
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from asgiref.wsgi import WsgiToAsgi
+from flask_login import user_logged_out
+
+from app import app, choose_encoding, run_trainer_action, run_trainer_batch, session_user_id, warm_up
+
+# 路径 -> (训练器操作名, 允许的请求方法)
+TRAINER_ROUTES = {
+    '/process_choice': ('process_choice', 'POST'),
+    '/next_word': ('next_word', 'GET'),
+    '/prev_word': ('prev_word', 'GET'),
+    '/redo_word': ('redo_word', 'GET'),
+    '/mark_learned': ('mark_learned', 'POST'),
+    '/preview': ('preview', 'GET'),
+    '/update_params': ('update_params', 'POST'),
+    '/reset_progress': ('reset_progress', 'POST'),
+    '/add_word': ('add_word', 'POST'),
+    '/edit_word': ('edit_word', 'POST'),
+}
+
+# 需要解析词库文件的操作放到单独的线程池，避免大文件解析挤占进度写入
+PARSE_ACTIONS = {'reset_progress'}
+
+MAX_BODY_SIZE = 64 * 1024  # 训练器接口的请求体都很小
+MAX_BATCH_SIZE = 32        # WebSocket一批最多合并的请求数
+
+# 除与 Host 相同的来源外，允许建立 WebSocket 连接的来源（如经反向代理改写了 Host 时的站点地址），逗号分隔
+ALLOWED_ORIGINS = {origin.strip().rstrip('/') for origin in os.environ.get('ASGI_ALLOWED_ORIGINS', '').split(',')
+                   if origin.strip()}
+
+parse_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('ASGI_PARSE_WORKERS', '2')), thread_name_prefix='parse')
+db_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('ASGI_DB_WORKERS', '4')), thread_name_prefix='db')
+
+flask_asgi = WsgiToAsgi(app)
+
+
+def request_context(scope):
+    """按ASGI请求构造Flask请求上下文：会话Cookie、客户端地址与Flask应用中相同，
+    登录校验经 Flask-Login 完成（会话保护、用户是否仍存在）"""
+    headers = [(name.decode('latin-1'), value.decode('latin-1')) for name, value in scope['headers']]
+    client = scope.get('client')
+    return app.test_request_context(
+        scope.get('path', '/'), headers=headers, environ_base={'REMOTE_ADDR': client[0] if client else ''})
+
+
+def authenticate(scope):
+    """在线程池中执行：返回登录用户id，未登录返回None"""
+    with request_context(scope):
+        return session_user_id()
+
+
+def header_value(headers, name):
+    for key, value in headers:
+        if key == name:
+            return value.decode('latin-1')
+    return None
+
+
+def origin_allowed(headers):
+    """浏览器发起的 WebSocket 连接带有 Origin：必须是本站（与 Host 相同）或在允许列表中；
+    没有 Origin 的非浏览器客户端不受跨站攻击影响，直接放行"""
+    origin = header_value(headers, b'origin')
+    if origin is None:
+        return True
+    if origin.rstrip('/') in ALLOWED_ORIGINS:
+        return True
+    host = header_value(headers, b'host')
+    return host is not None and urlsplit(origin).netloc.lower() == host.lower()
+
+
+# 本进程中打开的学习连接：用户id -> {(事件循环, 收件队列)}，用户登出时通知这些连接关闭
+LOGGED_OUT = object()
+_user_sockets = {}
+_user_sockets_lock = threading.Lock()
+
+
+@user_logged_out.connect_via(app)
+def close_user_sockets(sender, user=None, **extra):
+    # 在处理 /logout 的线程中调用
+    with _user_sockets_lock:
+        sockets = list(_user_sockets.get(getattr(user, 'id', None), ()))
+    for loop, inbox in sockets:
+        loop.call_soon_threadsafe(inbox.put_nowait, LOGGED_OUT)
+
+
+def call_trainer_action(scope, name, data):
+    """在线程池中执行：带上Flask请求上下文，结束时释放数据库会话；未登录返回None"""
+    with request_context(scope):
+        user_id = session_user_id()
+        if user_id is None:
+            return None
+        return run_trainer_action(name, user_id, data)
+
+
+async def read_body(receive):
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        if len(body) > MAX_BODY_SIZE:
+            return None
+        more_body = message.get('more_body', False)
+    return body
+
+
+def accept_encoding(headers):
+    return b', '.join(value for name, value in headers if name == b'accept-encoding').decode('latin-1')
+
+
+async def send_json(send, payload, status=200, accept=''):
+    """发送JSON响应；较大的响应在客户端支持时 gzip 压缩（与Flask应用的规则相同）"""
+    body = json.dumps(payload).encode('utf-8')
+    headers = [(b'content-type', b'application/json'), (b'vary', b'Accept-Encoding')]
+    if len(body) >= app.config['JSON_COMPRESS_MIN_SIZE'] and choose_encoding(accept, {'gzip'}) == 'gzip':
+        body = gzip.compress(body, 6)
+        headers.append((b'content-encoding', b'gzip'))
+    headers.append((b'content-length', str(len(body)).encode()))
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def handle_trainer_request(scope, receive, send, name, method):
+    if scope['method'] != method:
+        await send_json(send, {'success': False, 'message': '请求方法不支持'}, status=405)
+        return
+
+    if method == 'POST':
+        body = await read_body(receive)
+        if body is None:
+            await send_json(send, {'success': False, 'message': '请求体过大'}, status=413)
+            return
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+    else:
+        data = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+
+    executor = parse_executor if name in PARSE_ACTIONS else db_executor
+    loop = asyncio.get_running_loop()
+    payload = await loop.run_in_executor(executor, call_trainer_action, scope, name, data)
+    if payload is None:
+        await send_json(send, {'success': False, 'message': '请先登录'}, status=401)
+        return
+    await send_json(send, payload, accept=accept_encoding(scope['headers']))
+
+
+def call_trainer_batch(scope, user_id, actions):
+    """在线程池中批量执行训练器操作；会话已失效（登出、过期、用户已删除）时返回None"""
+    with request_context(scope):
+        if session_user_id() != user_id:
+            return None
+        return run_trainer_batch(user_id, actions)
+
+
+async def handle_trainer_socket(scope, receive, send):
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+
+    if not origin_allowed(scope['headers']):
+        await send({'type': 'websocket.close', 'code': 4403})
+        return
+    loop = asyncio.get_running_loop()
+    user_id = await loop.run_in_executor(db_executor, authenticate, scope)
+    if user_id is None:
+        await send({'type': 'websocket.close', 'code': 4401})
+        return
+    await send({'type': 'websocket.accept'})
+
+    inbox = asyncio.Queue()
+    registration = (loop, inbox)
+    with _user_sockets_lock:
+        _user_sockets.setdefault(user_id, set()).add(registration)
+
+    async def reader():
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                await inbox.put(None)
+                return
+            text = message.get('text')
+            if text is None and message.get('bytes') is not None:
+                text = message['bytes'].decode('utf-8', 'replace')
+            try:
+                request = json.loads(text)
+            except (TypeError, ValueError):
+                continue
+            if isinstance(request, dict):
+                await inbox.put(request)
+
+    async def send_message(payload):
+        await send({'type': 'websocket.send', 'text': json.dumps(payload)})
+
+    reader_task = asyncio.ensure_future(reader())
+    try:
+        closed = False
+        while not closed:
+            request = await inbox.get()
+            if request is None:
+                break
+
+            # 把已经到达的请求一起处理
+            batch = [request]
+            while len(batch) < MAX_BATCH_SIZE and not inbox.empty():
+                request = inbox.get_nowait()
+                if request is None:
+                    closed = True
+                    break
+                batch.append(request)
+
+            # 登出后不再执行积压的请求
+            if LOGGED_OUT in batch:
+                await send({'type': 'websocket.close', 'code': 4401})
+                break
+
+            actions = []
+            for request in batch:
+                data = request.get('data')
+                actions.append((str(request.get('action')), data if isinstance(data, dict) else {}))
+            executor = parse_executor if any(name in PARSE_ACTIONS for name, _ in actions) else db_executor
+            try:
+                outcome = await loop.run_in_executor(executor, call_trainer_batch, scope, user_id, actions)
+            except Exception as e:
+                # 整批失败（如写库出错）：逐条回复错误，连接保持可用
+                print(f"WebSocket 批量操作失败: {e}")
+                outcome = [{'success': False, 'message': '操作失败，请重试'}] * len(batch), None
+            if outcome is None:
+                # 每批执行前重新校验会话：已过期、用户已删除或会话保护不通过
+                await send({'type': 'websocket.close', 'code': 4401})
+                break
+            results, state = outcome
+
+            for request, result in zip(batch, results):
+                await send_message(dict(result, type='result', id=request.get('id')))
+            if state is not None:
+                await send_message(dict(state, type='state'))
+    finally:
+        reader_task.cancel()
+        with _user_sockets_lock:
+            sockets = _user_sockets.get(user_id)
+            sockets.discard(registration)
+            if not sockets:
+                del _user_sockets[user_id]
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            # 预热（编译模板、加载热门公开词库）在线程池中执行，完成后才开始接受请求
+            await asyncio.get_running_loop().run_in_executor(parse_executor, warm_up)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            parse_executor.shutdown(wait=True)
+            db_executor.shutdown(wait=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    if scope['type'] == 'websocket':
+        if scope['path'] == '/ws/trainer':
+            await handle_trainer_socket(scope, receive, send)
+        else:
+            await send({'type': 'websocket.close', 'code': 4404})
+        return
+
+    if scope['type'] == 'http':
+        route = TRAINER_ROUTES.get(scope['path'])
+        if route:
+            await handle_trainer_request(scope, receive, send, *route)
+            return
+
+    await flask_asgi(scope, receive, send)
@@ -0,0 +1,175 @@
+# coding: utf-8
+"""词库文件解析，支持多进程并行解析大文件
+
+- 文本文件（每行 单词<Tab>释义）按字节范围切成若干段，每段的边界都落在换行符之后，各段分别解析；
+- Excel 工作簿按工作表切分，每个工作表一个任务；
+- 各段在进程池中解析，按原顺序拼接，结果与顺序解析完全相同（共享词库按单词序号引用，顺序不能变）。
+
+本模块只依赖 openpyxl，进程池以 spawn 方式启动，子进程按模块名导入本模块执行解析函数。
+注意 spawn 的子进程还会重新执行父进程的主脚本（模块名为 __mp_main__）：用 gunicorn/uvicorn 启动时主脚本是服务器的入口，
+用 python app.py 启动时则是 app.py，所以 app.py 在 __mp_main__ 中跳过建表等启动操作。
+
+单独运行时比较顺序解析和并行解析的耗时：
+    python deck_ingest.py dictionary.txt --processes 4
+"""
+
+import argparse
+import io
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+from openpyxl import load_workbook
+
+MIN_CHUNK_BYTES = 1024 * 1024  # 文本文件每段至少这么大，太小的分段进程间传输的开销比解析还大
+
+_pool = {'executor': None, 'workers': 0}
+_pool_lock = threading.Lock()
+
+
+def is_workbook(filename):
+    return filename.endswith('.xlsx') or filename.endswith('.xls')
+
+
+def parse_lines(lines):
+    """解析文本行：每行 单词<Tab>释义，释义中的Tab保留"""
+    entries = []
+    for line in lines:
+        parts = line.strip().split('\t')
+        entries.append((parts[0], '\t'.join(parts[1:]) if len(parts) > 1 else ""))
+    return entries
+
+
+def parse_text_range(filename, start, end):
+    """解析文本文件 [start, end) 字节范围内的行（start、end 都在行首）"""
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # 换行符的处理与按文本模式打开文件一致（\r\n、\r 都视为换行）
+    return parse_lines(io.StringIO(data.decode('utf-8'), newline=None))
+
+
+def text_ranges(filename, chunk_bytes):
+    """把文本文件切成约 chunk_bytes 大小的字节范围，每段都在换行符之后结束"""
+    size = os.path.getsize(filename)
+    ranges = []
+    with open(filename, 'rb') as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()  # 移到下一行的开头（UTF-8 多字节字符中不会出现换行符）
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def iter_sheet_rows(ws):
+    for row in ws.iter_rows(min_row=1, values_only=True):
+        if not row:
+            continue
+        word = str(row[0]) if row[0] is not None else ""
+        if word == "":
+            continue
+        definition = str(row[1]) if len(row) > 1 and row[1] is not None else ""
+        yield word, definition
+
+
+def parse_sheet(filename, index):
+    """解析工作簿中第 index 个工作表"""
+    wb = load_workbook(filename=filename, read_only=True, data_only=True)
+    try:
+        return list(iter_sheet_rows(wb.worksheets[index]))
+    finally:
+        wb.close()
+
+
+def iter_deck(filename):
+    """顺序逐个读出 (单词, 释义)；工作簿依次读取所有工作表"""
+    if is_workbook(filename):
+        wb = load_workbook(filename=filename, read_only=True, data_only=True)
+        try:
+            for ws in wb.worksheets:
+                yield from iter_sheet_rows(ws)
+        finally:
+            wb.close()
+    else:
+        with open(filename, 'r', encoding='utf-8') as f:
+            yield from parse_lines(f)
+
+
+def get_pool(workers):
+    """进程池（按需创建并复用；子进程以 spawn 方式启动）"""
+    with _pool_lock:
+        if _pool['executor'] is None or _pool['workers'] != workers:
+            if _pool['executor'] is not None:
+                _pool['executor'].shutdown(wait=False)
+            _pool['executor'] = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+            _pool['workers'] = workers
+        return _pool['executor']
+
+
+def parse_deck(filename, processes=None, min_parallel_bytes=4 * 1024 * 1024):
+    """解析整个词库文件，返回 [(单词, 释义)]。
+
+    文件不小于 min_parallel_bytes 且可以切分（文本文件，或有多个工作表的工作簿）时在进程池中并行解析，
+    否则顺序解析。processes 为进程数，默认CPU核数；为1时总是顺序解析。
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes <= 1 or os.path.getsize(filename) < min_parallel_bytes:
+        return list(iter_deck(filename))
+
+    if is_workbook(filename):
+        wb = load_workbook(filename=filename, read_only=True)
+        sheets = len(wb.sheetnames)
+        wb.close()
+        if sheets <= 1:
+            return list(iter_deck(filename))
+        tasks = [(parse_sheet, filename, index) for index in range(sheets)]
+    else:
+        # 每个进程分到几段，解析快慢不均时也能保持各进程都有活干
+        chunk_bytes = max(MIN_CHUNK_BYTES, os.path.getsize(filename) // (processes * 4) + 1)
+        tasks = [(parse_text_range, filename, start, end) for start, end in text_ranges(filename, chunk_bytes)]
+
+    pool = get_pool(min(processes, len(tasks)))
+    try:
+        futures = [pool.submit(*task) for task in tasks]
+        entries = []
+        for future in futures:
+            entries.extend(future.result())
+    except BrokenProcessPool:
+        # 子进程异常退出（如被系统杀掉）：丢弃进程池，这次改为顺序解析
+        with _pool_lock:
+            if _pool['executor'] is pool:
+                _pool['executor'] = None
+        pool.shutdown(wait=False)
+        return list(iter_deck(filename))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较顺序解析和并行解析词库文件的耗时")
+    parser.add_argument('path', help="词库文件（txt 或 xlsx）")
+    parser.add_argument('--processes', type=int, nargs='+', default=[os.cpu_count() or 1],
+                        help="并行解析使用的进程数，可以给出多个")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    expected = list(iter_deck(args.path))
+    sequential = time.perf_counter() - t0
+    print(f"顺序解析：{len(expected)} 条，{sequential:.2f}s，{len(expected) / sequential:,.0f} 条/秒")
+    for processes in args.processes:
+        parse_deck(args.path, processes, min_parallel_bytes=0)  # 预热进程池
+        t0 = time.perf_counter()
+        entries = parse_deck(args.path, processes, min_parallel_bytes=0)
+        elapsed = time.perf_counter() - t0
+        status = "一致" if entries == expected else "不一致！"
+        print(f"{processes} 个进程：{len(entries)} 条，{elapsed:.2f}s，{len(entries) / elapsed:,.0f} 条/秒，"
+              f"加速 {sequential / elapsed:.2f}x，结果{status}")
+
+
+if __name__ == '__main__':
+    main()
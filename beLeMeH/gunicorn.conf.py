@@ -0,0 +1,42 @@
+# coding: utf-8
+"""gunicorn 配置：preload 模式下应用只在主进程中导入一次
+
+- 建表检查（ensure_schema）在导入应用时执行，因此只在主进程中执行一次；
+- 主进程绑定端口后执行 warm_up()：编译模板、准备静态资源、加载热门公开词库，
+  再用 gc.freeze() 把这些对象移出垃圾回收的扫描范围，worker fork 后以写时复制方式共享；
+- 每个 worker fork 后丢弃从主进程继承的数据库连接。
+
+训练器状态保存在进程内存中，默认仍只有一个 worker（WEB_CONCURRENCY 可以调整）。
+GUNICORN_PRELOAD=0 时不使用 preload，每个 worker 各自导入应用并在启动后预热。
+"""
+
+import gc
+import os
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from app import warm_up
+    state = warm_up()
+    server.log.info("预热完成：模板 %s 个，词库 %s 个，用时 %ss", state['templates'], state['decks'], state['seconds'])
+    # 之后新建的对象不受影响；预热创建的对象不再被GC扫描，避免 worker 中因GC写入而复制内存页
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    from app import app, dispose_engines
+    with app.app_context():
+        # 连接池（主库和进度分片）中继承自主进程的连接不能在子进程中使用，丢弃但不关闭（关闭会影响主进程）
+        dispose_engines()
+
+
+def post_worker_init(worker):
+    if preload_app:
+        return
+    from app import warm_up
+    warm_up()
@@ -0,0 +1,74 @@
+# coding: utf-8
+"""后台任务工作进程：从数据库的 job 表中领取并执行任务（解析上传文件、删除文件、压缩进度、重新统计、导出）
+
+Web进程默认也会启动 JOB_WORKERS 个工作线程；任务较多时单独运行本脚本，并把Web进程的 JOB_WORKERS 设为0，
+解析 xlsx 等耗CPU的任务就不会和请求争用同一个进程。多个工作进程可以同时运行，
+每类任务同时执行的数量受 JOB_KIND_LIMITS 限制（所有进程合计）。
+
+用法：
+    python job_worker.py                  # 2个工作进程，Ctrl+C 或 SIGTERM 时执行完当前任务后退出
+    python job_worker.py --processes 4
+    python job_worker.py --once           # 执行完队列中现有的任务后退出（适合定时任务）
+    python job_worker.py --enqueue compact_progress  # 为所有文件提交一个压缩进度任务
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+
+
+def worker_main(index, stop, once):
+    # 使用 spawn 启动：每个进程各自导入应用、建立自己的数据库连接
+    from app import app, run_next_job, work_jobs
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # 由主进程统一通知退出
+    worker_id = f'{socket.gethostname()}-{os.getpid()}-{index}'
+    if once:
+        with app.app_context():
+            while not stop.is_set() and run_next_job(worker_id):
+                pass
+    else:
+        work_jobs(worker_id, stop)
+
+
+def enqueue(kind):
+    from app import app, enqueue_job
+
+    app.config['JOB_WORKERS'] = 0  # 只提交，不在本进程中执行
+    with app.app_context():
+        job_id = enqueue_job(kind).id
+    print(f"已提交任务 {job_id}（{kind}）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="后台任务工作进程")
+    parser.add_argument('--processes', type=int, default=2, help="工作进程数")
+    parser.add_argument('--once', action='store_true', help="队列中没有可执行的任务时退出")
+    parser.add_argument('--enqueue', choices=['compact_progress', 'recount_stats'],
+                        help="为所有文件提交一个任务后退出")
+    args = parser.parse_args()
+
+    if args.enqueue:
+        enqueue(args.enqueue)
+        return
+
+    context = multiprocessing.get_context('spawn')
+    stop = context.Event()
+    processes = [context.Process(target=worker_main, args=(i, stop, args.once), name=f'job-worker-{i}')
+                 for i in range(max(1, args.processes))]
+    for process in processes:
+        process.start()
+
+    def request_stop(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    for process in processes:
+        process.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+# coding: utf-8
+"""登录吞吐量基准：模拟上课开始时大量学生同时登录
+
+两种模式：
+    - 本地（默认）：不经过HTTP，直接用应用的密码线程池校验密码，比较不同哈希代价、线程数下的吞吐量；
+      同时给出在请求线程中直接计算（不使用线程池）的结果作为对照。
+    - --url：向运行中的服务器并发提交 /login 表单，统计成功（302）、繁忙（503）和失败的次数。
+
+用法：
+    python login_bench.py --logins 200 --clients 50
+    python login_bench.py --method pbkdf2:sha256:600000 --workers 4
+    python login_bench.py --url http://127.0.0.1:5000 --username alice --password secret --logins 500 --clients 100
+"""
+
+import argparse
+import http.client
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+
+def run_clients(login, logins, clients):
+    """clients 个线程共完成 logins 次登录，返回 (每次耗时数组, 各结果计数, 总耗时)"""
+    latencies = []
+    outcomes = {}
+    lock = threading.Lock()
+
+    def one(_):
+        t0 = time.perf_counter()
+        outcome = login()
+        elapsed = time.perf_counter() - t0
+        with lock:
+            latencies.append(elapsed)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(one, range(logins)))
+    return np.array(latencies), outcomes, time.perf_counter() - start
+
+
+def report(title, latencies, outcomes, total):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    print(f"{title:<24} {len(latencies) / total:>8.1f}/s  p50 {p50:>7.1f}ms  p95 {p95:>7.1f}ms  "
+          f"p99 {p99:>7.1f}ms  {outcomes}")
+
+
+def bench_local(args):
+    if args.method:
+        os.environ['PASSWORD_HASH_METHOD'] = args.method
+    if args.workers:
+        os.environ['PASSWORD_HASH_WORKERS'] = str(args.workers)
+    from app import (app, PasswordHashBusy, check_login_password, generate_password_hash, hash_password,
+                     run_password_task)
+
+    password = 'benchmark-password'
+    current = hash_password(password)
+    legacy = generate_password_hash(password, method='pbkdf2:sha256:1000')
+    print(f"算法 {app.config['PASSWORD_HASH_METHOD']}，线程池 {app.config['PASSWORD_HASH_WORKERS']} 个线程，"
+          f"排队上限 {app.config['PASSWORD_HASH_QUEUE']}，{args.clients} 个并发客户端 × {args.logins} 次登录")
+
+    def pooled(stored_hash):
+        def login():
+            try:
+                valid, _ = run_password_task(check_login_password, stored_hash, password)
+            except PasswordHashBusy:
+                return 'busy'
+            return 'ok' if valid else 'failed'
+        return login
+
+    def inline():
+        valid, _ = check_login_password(current, password)
+        return 'ok' if valid else 'failed'
+
+    report("请求线程中直接计算", *run_clients(inline, args.logins, args.clients))
+    report("密码线程池", *run_clients(pooled(current), args.logins, args.clients))
+    report("线程池+升级旧哈希", *run_clients(pooled(legacy), args.logins, args.clients))
+
+
+def bench_http(args):
+    parts = urlsplit(args.url)
+    body = urlencode({'username': args.username, 'password': args.password})
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+    def login():
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        connection = connection_class(parts.netloc, timeout=args.timeout)
+        try:
+            connection.request('POST', parts.path.rstrip('/') + '/login', body, headers)
+            status = connection.getresponse().status
+        except OSError:
+            return 'error'
+        finally:
+            connection.close()
+        # 登录成功重定向到学习页面，密码错误时返回登录页（200）
+        return {302: 'ok', 503: 'busy', 200: 'failed'}.get(status, status)
+
+    print(f"{args.url}：{args.clients} 个并发客户端 × {args.logins} 次登录")
+    report("HTTP /login", *run_clients(login, args.logins, args.clients))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="登录吞吐量基准")
+    parser.add_argument('--logins', type=int, default=200, help="登录总次数")
+    parser.add_argument('--clients', type=int, default=50, help="并发客户端数")
+    parser.add_argument('--method', help="本地模式：密码哈希算法（默认使用 PASSWORD_HASH_METHOD 配置）")
+    parser.add_argument('--workers', type=int, help="本地模式：密码线程池大小")
+    parser.add_argument('--url', help="压测运行中的服务器，如 http://127.0.0.1:5000")
+    parser.add_argument('--username', help="--url 模式使用的账号")
+    parser.add_argument('--password', help="--url 模式使用的密码")
+    parser.add_argument('--timeout', type=float, default=30, help="--url 模式单个请求的超时秒数")
+    args = parser.parse_args()
+
+    if args.url:
+        if not args.username or args.password is None:
+            parser.error("--url 模式需要 --username 和 --password")
+        bench_http(args)
+    else:
+        bench_local(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# coding: utf-8
+"""学习进度的批量导出/导入（整个数据库或单个用户）
+
+导出格式与网页上的 /export_progress 相同：每行一条JSON记录（NDJSON），文件名以 .gz 结尾时 gzip 压缩。
+逐行读写、按批提交，不会一次把所有 progress_data 读入内存，适合备份和迁移。
+
+用法：
+    python progress_io.py export backup.ndjson.gz
+    python progress_io.py export alice.ndjson --user alice
+    python progress_io.py import backup.ndjson.gz
+    python progress_io.py import alice.ndjson --user alice
+
+导入按用户名对应用户（--user 时全部导入到该用户名下），按上传目录中的文件名对应文件；
+不存在的用户、上传目录中找不到的文件会被跳过。运行中的Web进程里已打开的训练会话不会自动刷新。
+"""
+
+import argparse
+import sys
+
+from app import (app, db, User, gzip_chunks, import_progress_records, iter_progress_records,
+                 open_progress_stream)
+
+
+def find_user_id(username):
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        sys.exit(f"用户 {username} 不存在")
+    return user.id
+
+
+def export_progress(path, username=None):
+    user_id = find_user_id(username) if username else None
+    lines = iter_progress_records(user_id)
+    if path.endswith('.gz'):
+        with open(path, 'wb') as f:
+            for chunk in gzip_chunks(lines):
+                f.write(chunk)
+    else:
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            for line in lines:
+                f.write(line)
+
+
+def import_progress(path, username=None):
+    user_id = find_user_id(username) if username else None
+    with open(path, 'rb') as f:
+        counts, _ = import_progress_records(open_progress_stream(f), user_id)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量导出/导入学习进度")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for command, help_text in (('export', "导出进度到文件"), ('import', "从文件导入进度")):
+        sub = subparsers.add_parser(command, help=help_text)
+        sub.add_argument('path', help="NDJSON 文件，以 .gz 结尾时为 gzip 压缩")
+        sub.add_argument('--user', help="只处理该用户（默认全部用户）")
+    args = parser.parse_args()
+
+    with app.app_context():
+        if args.command == 'export':
+            export_progress(args.path, args.user)
+            print(f"已导出到 {args.path}")
+        else:
+            counts = import_progress(args.path, args.user)
+            print(f"更新 {counts['updated']}，新建 {counts['created']}，"
+                  f"跳过 {counts['skipped']}，无效 {counts['invalid']}")
+
+
+if __name__ == '__main__':
+    main()
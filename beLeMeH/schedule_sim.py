@@ -0,0 +1,224 @@
+# coding: utf-8
+"""离线排程模拟器：为 /update_params 的 a、b 参数挑选合适的取值
+
+完整复现 VocabularyTrainer.process_choice 的插入规则：
+    - L 插入到第 a 位，M 插入到第 b 位
+    - H 插入到 基数 × 2 × 3 × ... × (连续H数+1) 位，基数取连续H之前最后一个非H字符（L→a，M→b，全是H时按L）
+    - 连续6个H，或第一次见到就选H，移入已学习队列
+    - 插入位置超过队列长度时放到队尾
+
+学习者用一个简单的遗忘模型模拟：每个单词有稳定度，间隔（两次出现之间的答题次数）越长越容易忘；
+答对(H)后稳定度增长更多，模糊(M)增长较少，陌生(L)则回到初始值。
+成千上万个会话以 NumPy 数组批量同步推进，每一步所有会话同时答一题。
+
+用法：
+    python schedule_sim.py --deck-sizes 500 2000 --sessions 2000 --reviews 3000
+    python schedule_sim.py --a 3 5 10 --b 8 15 30 --json result.json
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+CHOICE_L, CHOICE_M, CHOICE_H = 0, 1, 2
+
+GRADUATE_H_COUNT = 6  # 连续多少个H移入已学习队列
+SMALL_SHIFT = 256     # 插入位置不超过此值的会话用批量索引处理，更远的逐个会话整段移动
+
+# (n+1)!：连续 n 个H时的乘数 2×3×...×(n+1)
+_H_FACTOR = np.array([1, 2, 6, 24, 120, 720, 5040], dtype=np.int64)
+
+
+class LearnerModel:
+    """合成学习者模型参数"""
+    def __init__(self, known_ratio=0.2, initial_stability=8.0, growth_h=2.5, growth_m=1.3,
+                 m_ratio=0.5, ability_spread=0.3, known_stability=5000.0, retention_gap=500):
+        self.known_ratio = known_ratio              # 第一次见到就认识的单词比例（均值）
+        self.initial_stability = initial_stability  # 新学单词的初始稳定度（以答题次数计）
+        self.growth_h = growth_h                    # 选H后稳定度的增长倍数
+        self.growth_m = growth_m                    # 选M后稳定度的增长倍数
+        self.m_ratio = m_ratio                      # 没想起来时选M而不是L的概率
+        self.ability_spread = ability_spread        # 学习者之间记忆能力的差异（对数正态标准差）
+        self.known_stability = known_stability      # 初见即认识的单词的稳定度
+        self.retention_gap = retention_gap          # 评估已学习单词保持率时使用的间隔
+
+
+def simulate(deck_size, a, b, sessions=1000, reviews=3000, model=None, seed=0, trace=None):
+    """模拟 sessions 个会话各答 reviews 题，返回统计指标字典。
+
+    trace 为字典时记录排程过程，用于和 VocabularyTrainer 对照（见 tests/test_schedule_sim.py）：
+    trace['steps'] 为每一步的 (会话编号, 单词编号, 选择) 数组，trace['queues'] 为结束时各会话的待学习队列。
+    """
+    model = model or LearnerModel()
+    rng = np.random.default_rng(seed)
+    S, N = sessions, deck_size
+    rows = np.arange(S)
+
+    # 待学习队列：每行一个会话，head 指向队首，多留一列便于整体右移读取
+    queue = np.empty((S, N + 1), dtype=np.int32)
+    queue[:, :N] = np.arange(N, dtype=np.int32)
+    head = np.zeros(S, dtype=np.int64)
+    length = np.full(S, N, dtype=np.int64)
+
+    # 每个单词的标签只需保留：是否见过、末尾连续H数、连续H之前的字符是否为L
+    seen = np.zeros((S, N), dtype=bool)
+    h_run = np.zeros((S, N), dtype=np.int8)
+    base_is_l = np.ones((S, N), dtype=bool)
+
+    # 遗忘模型状态
+    ability = rng.lognormal(0.0, model.ability_spread, size=S).astype(np.float32)
+    known = rng.random((S, N)) < rng.beta(2, 2 / max(model.known_ratio, 1e-6) - 2, size=(S, 1))
+    stability = np.zeros((S, N), dtype=np.float32)
+    last_seen = np.zeros((S, N), dtype=np.int64)
+
+    total_reviews = 0
+    repeat_reviews = 0
+    graduated = 0
+    displaced = 0
+    retention_sum = 0.0
+
+    for t in range(reviews):
+        active = rows[length > 0]
+        if active.size == 0:
+            break
+        h = head[active]
+        w = queue[active, h]
+
+        first = ~seen[active, w]
+        gap = (t - last_seen[active, w]).astype(np.float32)
+        stab = stability[active, w]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p_recall = np.where(first, known[active, w], np.exp(-gap / np.maximum(stab, 1e-6)))
+
+        # 想起来选H；没想起来按比例选M或L
+        u = rng.random(active.size)
+        choice = np.where(u < p_recall, CHOICE_H,
+                          np.where(rng.random(active.size) < model.m_ratio, CHOICE_M, CHOICE_L))
+        if trace is not None:
+            trace.setdefault('steps', []).append((active, w.copy(), choice))
+
+        # 更新标签
+        is_h = choice == CHOICE_H
+        new_run = np.where(is_h, h_run[active, w] + 1, 0).astype(np.int8)
+        new_base_l = np.where(is_h, base_is_l[active, w], choice == CHOICE_L)
+        h_run[active, w] = new_run
+        base_is_l[active, w] = new_base_l
+        seen[active, w] = True
+        last_seen[active, w] = t
+
+        # 更新稳定度
+        start = model.initial_stability * ability[active]
+        stab = np.where(first, start, stab)
+        stab = np.where(choice == CHOICE_H, stab * model.growth_h * ability[active],
+                        np.where(choice == CHOICE_M, stab * model.growth_m, start))
+        graduate = is_h & ((new_run >= GRADUATE_H_COUNT) | first)
+        stab = np.where(first & is_h, model.known_stability, stab)
+        stability[active, w] = stab
+
+        # 计算插入位置（0-based，相对于弹出队首后的队列）
+        base = np.where(new_base_l, a, b)
+        h_pos = base * _H_FACTOR[np.minimum(new_run, len(_H_FACTOR) - 1)]
+        insert = np.where(choice == CHOICE_L, a, np.where(choice == CHOICE_M, b, h_pos)) - 1
+        insert = np.clip(insert, 0, length[active] - 1)
+
+        total_reviews += active.size
+        repeat_reviews += int(np.count_nonzero(~first))
+        graduated += int(np.count_nonzero(graduate))
+        retention_sum += float(np.exp(-model.retention_gap / stab[graduate]).sum())
+
+        # 移入已学习队列：队首后移即可
+        done = active[graduate]
+        head[done] += 1
+        length[done] -= 1
+
+        # 插回待学习队列：队首之后的 k 个单词前移一位，单词放到第 k 位
+        keep = ~graduate
+        ins_rows, ins_head, ins_k, ins_w = active[keep], h[keep], insert[keep], w[keep]
+        displaced += int(ins_k.sum())
+
+        small = ins_k <= SMALL_SHIFT
+        if np.any(small):
+            r, hs, ks, ws = ins_rows[small], ins_head[small], ins_k[small], ins_w[small]
+            width = int(ks.max()) + 1
+            j = np.arange(width)
+            cols = np.minimum(hs[:, None] + j, N - 1)  # 超出 k 的列只是占位，不会写回
+            shifted = queue[r[:, None], cols + 1]
+            window = np.where(j < ks[:, None], shifted, ws[:, None])
+            mask = j <= ks[:, None]
+            queue[np.broadcast_to(r[:, None], cols.shape)[mask], cols[mask]] = window[mask]
+
+        for r, hs, ks, ws in zip(ins_rows[~small], ins_head[~small], ins_k[~small], ins_w[~small]):
+            queue[r, hs:hs + ks] = queue[r, hs + 1:hs + ks + 1]
+            queue[r, hs + ks] = ws
+
+    if trace is not None:
+        trace['queues'] = [queue[r, head[r]:head[r] + length[r]].tolist() for r in range(S)]
+    return {
+        'deck_size': deck_size,
+        'a': a,
+        'b': b,
+        'reviews': total_reviews,
+        'graduated_per_review': graduated / total_reviews if total_reviews else 0.0,
+        'review_load': repeat_reviews / total_reviews if total_reviews else 0.0,
+        'queue_churn': displaced / total_reviews if total_reviews else 0.0,
+        'retention': retention_sum / graduated if graduated else 0.0,
+        'graduated_ratio': graduated / (sessions * deck_size),
+    }
+
+
+def recommend(results, min_retention):
+    """在保持率达标的参数中挑选每次答题毕业单词最多的一组；都不达标时选保持率最高的"""
+    qualified = [r for r in results if r['retention'] >= min_retention]
+    if qualified:
+        return max(qualified, key=lambda r: (r['graduated_per_review'], -r['queue_churn']))
+    return max(results, key=lambda r: r['retention'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模拟不同 a、b 参数下的复习排程")
+    parser.add_argument('--deck-sizes', type=int, nargs='+', default=[500, 2000])
+    parser.add_argument('--a', type=int, nargs='+', default=[3, 5, 10, 20])
+    parser.add_argument('--b', type=int, nargs='+', default=[8, 15, 30, 60])
+    parser.add_argument('--sessions', type=int, default=1000, help="每组参数模拟的会话数")
+    parser.add_argument('--reviews', type=int, default=3000, help="每个会话的答题次数")
+    parser.add_argument('--known-ratio', type=float, default=0.2, help="初见即认识的单词比例")
+    parser.add_argument('--min-retention', type=float, default=0.8, help="推荐参数要求的最低保持率")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="把全部结果写入该JSON文件")
+    args = parser.parse_args()
+
+    for value in args.a + args.b:
+        if value < 1 or value > 100:
+            parser.error("a、b 取值范围为 1-100（与 /update_params 一致）")
+
+    model = LearnerModel(known_ratio=args.known_ratio)
+    all_results = []
+    recommendations = {}
+    for deck_size in args.deck_sizes:
+        print(f"\n===== 词库大小 {deck_size}，{args.sessions} 个会话 × {args.reviews} 次答题 =====")
+        print(f"{'a':>4} {'b':>4} {'毕业/答题':>10} {'复习占比':>8} {'队列移动':>8} {'保持率':>7} {'耗时':>7}")
+        results = []
+        for a in args.a:
+            for b in args.b:
+                t0 = time.perf_counter()
+                r = simulate(deck_size, a, b, sessions=args.sessions, reviews=args.reviews,
+                             model=model, seed=args.seed)
+                elapsed = time.perf_counter() - t0
+                results.append(r)
+                print(f"{a:>4} {b:>4} {r['graduated_per_review']:>10.4f} {r['review_load']:>8.3f} "
+                      f"{r['queue_churn']:>8.1f} {r['retention']:>7.3f} {elapsed:>6.1f}s")
+        best = recommend(results, args.min_retention)
+        recommendations[deck_size] = {'a': best['a'], 'b': best['b']}
+        print(f"推荐参数: a={best['a']}, b={best['b']}")
+        all_results.extend(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'results': all_results, 'recommendations': recommendations}, f,
+                      ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,80 @@
 document.addEventListener('DOMContentLoaded', function() {
+    // 训练器接口：学习页面优先通过 WebSocket（/ws/trainer，ASGI模式下可用）发送，
+    // 连接不可用时退回普通 HTTP 请求，两种方式返回的数据格式相同
+    const TRAINER_HTTP_ROUTES = {
+        process_choice: ['POST', '/process_choice'],
+        next_word: ['GET', '/next_word'],
+        prev_word: ['GET', '/prev_word'],
+        redo_word: ['GET', '/redo_word'],
+        mark_learned: ['POST', '/mark_learned'],
+        preview: ['GET', '/preview'],
+        update_params: ['POST', '/update_params'],
+        reset_progress: ['POST', '/reset_progress'],
+        add_word: ['POST', '/add_word'],
+        edit_word: ['POST', '/edit_word']
+    };
+    let trainerSocket = null;
+    let nextRequestId = 1;
+    const pendingRequests = new Map();
+    
+    function openTrainerSocket() {
+        if (!document.querySelector('.trainer-container') || !window.WebSocket) return;
+        
+        const protocol = location.protocol === 'https:' ? 'wss://' : 'ws://';
+        const socket = new WebSocket(protocol + location.host + '/ws/trainer');
+        
+        socket.onopen = function() {
+            trainerSocket = socket;
+        };
+        
+        socket.onmessage = function(event) {
+            const message = JSON.parse(event.data);
+            if (message.type === 'result') {
+                const pending = pendingRequests.get(message.id);
+                if (pending) {
+                    pendingRequests.delete(message.id);
+                    pending.resolve(message);
+                }
+            } else if (message.type === 'state') {
+                // 服务端推送的最新状态
+                updateStatusDisplay(message.status);
+            }
+        };
+        
+        socket.onclose = function() {
+            trainerSocket = null;
+            // 连接断开时尚未返回的请求无法确认是否已执行，交给调用方提示
+            pendingRequests.forEach(pending => pending.reject(new Error('连接已断开')));
+            pendingRequests.clear();
+        };
+    }
+    
+    function callTrainer(action, data) {
+        data = data || {};
+        if (trainerSocket && trainerSocket.readyState === WebSocket.OPEN) {
+            return new Promise((resolve, reject) => {
+                const id = nextRequestId++;
+                pendingRequests.set(id, {resolve, reject});
+                trainerSocket.send(JSON.stringify({id: id, action: action, data: data}));
+            });
+        }
+        
+        const [method, url] = TRAINER_HTTP_ROUTES[action];
+        if (method === 'GET') {
+            const query = new URLSearchParams(data).toString();
+            return fetch(query ? url + '?' + query : url).then(response => response.json());
+        }
+        return fetch(url, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(data)
+        }).then(response => response.json());
+    }
+    
+    openTrainerSocket();
+    
     // 更新单词显示
     function updateWordDisplay(word) {
         document.querySelector('.word').textContent = word.word;
@@ -14,6 +90,45 @@ document.addEventListener('DOMContentLoaded', function() {
         document.querySelector('.tag-display span').textContent = `标签: ${tag}`;
     }
     
+    // 预览每种选择的去向（L/M/H/已掌握），按钮悬停时显示之后将出现的单词
+    function loadPreview() {
+        const previewSpan = document.querySelector('.preview-display span');
+        if (!previewSpan) return;
+        
+        callTrainer('preview', {n: 5})
+        .then(data => {
+            if (!data.success || !data.previews.L) {
+                previewSpan.textContent = '';
+                return;
+            }
+            const labels = {L: 'L', M: 'M', H: 'H', learned: '✓'};
+            const parts = [];
+            for (const choice of ['L', 'M', 'H', 'learned']) {
+                const preview = data.previews[choice];
+                parts.push(`${labels[choice]}→${preview.learned ? '已学习' : '第' + preview.position + '位'}`);
+                
+                const button = choice === 'learned'
+                    ? document.querySelector('.choice-btn.master')
+                    : document.querySelector(`.choice-btn[data-choice="${choice}"]`);
+                if (button) {
+                    button.title = '接下来: ' + preview.upcoming.map(w => w.word).join(', ');
+                }
+            }
+            previewSpan.textContent = '预览: ' + parts.join(' | ');
+        })
+        .catch(error => {
+            console.error('获取预览失败:', error);
+        });
+    }
+    
+    // 清空预览（做出选择后预览不再适用）
+    function clearPreview() {
+        const previewSpan = document.querySelector('.preview-display span');
+        if (previewSpan) previewSpan.textContent = '';
+    }
+    
+    loadPreview();
+    
     // 删除文件按钮
     document.querySelectorAll('.delete-file').forEach(button => {
         button.addEventListener('click', function() {
@@ -53,16 +168,9 @@ document.addEventListener('DOMContentLoaded', function() {
             }
             
             // 发送选择到服务器
-            fetch('/process_choice', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    choice: choice
-                })
+            callTrainer('process_choice', {
+                choice: choice
             })
-            .then(response => response.json())
             .then(data => {
                 if (data.success) {
                     // 更新界面
@@ -75,6 +183,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     
                     // 设置按钮状态：选择后释义出现，选择按钮禁用，上一个按钮不可用，下一个按钮可用
                     setButtonStates(false, false, true);
+                    clearPreview();
                 } else {
                     alert(data.message);
                 }
@@ -84,8 +193,7 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // 下一个单词按钮
     document.querySelector('.action-btn.next').addEventListener('click', function() {
-        fetch('/next_word')
-        .then(response => response.json())
+        callTrainer('next_word')
         .then(data => {
             if (data.success) {
                 // 更新单词显示
@@ -102,44 +210,62 @@ document.addEventListener('DOMContentLoaded', function() {
                 
                 // 设置按钮状态：新单词出现，可以选择熟悉度，上一个按钮可用，下一个按钮不可用
                 setButtonStates(true, true, false);
+                loadPreview();
             } else {
                 alert(data.message);
             }
         });
     });
     
-    // 上一个单词按钮
+    // 撤销/重做后显示返回的单词
+    function showUndoResult(data) {
+        if (!data.success) {
+            alert(data.message);
+            return;
+        }
+        // 更新单词显示
+        document.querySelector('.word').textContent = data.word.word;
+        
+        // 更新标签显示
+        document.querySelector('.tag-display span').textContent = `标签: ${data.word.tag}`;
+        
+        // 更新状态显示
+        document.querySelector('.status-display span').textContent = data.status;
+        
+        // 清空释义（上一个单词时不显示释义）
+        document.querySelector('.definition-content').textContent = '';
+        
+        // 单词未作答时可以选择熟悉度，已作答时只能继续下一个；可以连续撤销多步
+        if (data.answered) {
+            setButtonStates(false, data.can_undo, true);
+            clearPreview();
+        } else {
+            setButtonStates(true, data.can_undo, false);
+            loadPreview();
+        }
+        const redoBtn = document.querySelector('.action-btn.redo');
+        if (redoBtn) {
+            redoBtn.disabled = !data.can_redo;
+            redoBtn.style.opacity = data.can_redo ? '1' : '0.5';
+        }
+    }
+    
+    // 上一个单词按钮（撤销）
     document.querySelector('.action-btn.prev').addEventListener('click', function() {
-        fetch('/prev_word')
-        .then(response => response.json())
-        .then(data => {
-            if (data.success) {
-                // 更新单词显示
-                document.querySelector('.word').textContent = data.word.word;
-                
-                // 更新标签显示
-                document.querySelector('.tag-display span').textContent = `标签: ${data.word.tag}`;
-                
-                // 更新状态显示
-                document.querySelector('.status-display span').textContent = data.status;
-                
-                // 清空释义（上一个单词时不显示释义）
-                document.querySelector('.definition-content').textContent = '';
-                
-                // 设置按钮状态：上一个单词出现，可以选择熟悉度，上一个按钮不可用，下一个按钮不可用
-                setButtonStates(true, false, false);
-            } else {
-                alert(data.message);
-            }
-        });
+        callTrainer('prev_word').then(showUndoResult);
     });
     
+    // 重做按钮
+    const redoButton = document.querySelector('.action-btn.redo');
+    if (redoButton) {
+        redoButton.addEventListener('click', function() {
+            callTrainer('redo_word').then(showUndoResult);
+        });
+    }
+    
     // 标记为已掌握
     function markAsLearned() {
-        fetch('/mark_learned', {
-            method: 'POST'
-        })
-        .then(response => response.json())
+        callTrainer('mark_learned')
         .then(data => {
             if (data.success) {
                 // 更新单词显示
@@ -156,6 +282,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 
                 // 设置按钮状态：标记已掌握后，选择按钮禁用，上一个按钮不可用，下一个按钮可用
                 setButtonStates(false, false, true);
+                clearPreview();
             } else {
                 alert(data.message);
             }
@@ -165,10 +292,7 @@ document.addEventListener('DOMContentLoaded', function() {
     // 重置进度按钮
     document.querySelector('.bottom-btn.reset').addEventListener('click', function() {
         if (confirm('确定要重置学习进度吗？这将删除所有保存的数据并重新开始。')) {
-            fetch('/reset_progress', {
-                method: 'POST'
-            })
-            .then(response => response.json())
+            callTrainer('reset_progress')
             .then(data => {
                 if (data.success) {
                     // 更新单词显示
@@ -190,6 +314,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     
                     // 禁用下一个按钮
                     document.querySelector('.action-btn.next').disabled = true;
+                    loadPreview();
                     
                     alert(data.message);
                 } else {
@@ -207,17 +332,10 @@ document.addEventListener('DOMContentLoaded', function() {
         const definition = prompt('请输入释义:');
         if (!definition) return;
         
-        fetch('/add_word', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                word: word,
-                definition: definition
-            })
+        callTrainer('add_word', {
+            word: word,
+            definition: definition
         })
-        .then(response => response.json())
         .then(data => {
             if (data.success) {
                 // 更新单词显示
@@ -246,17 +364,10 @@ document.addEventListener('DOMContentLoaded', function() {
         const newDefinition = prompt('编辑释义:', currentDefinition);
         if (!newDefinition) return;
         
-        fetch('/edit_word', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                word: newWord,
-                definition: newDefinition
-            })
+        callTrainer('edit_word', {
+            word: newWord,
+            definition: newDefinition
         })
-        .then(response => response.json())
         .then(data => {
             if (data.success) {
                 // 更新单词显示
@@ -361,21 +472,20 @@ document.addEventListener('DOMContentLoaded', function() {
                 return; // 无效值时不更新
             }
             
-            fetch('/update_params', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    a: parseInt(a),
-                    b: parseInt(b)
-                })
+            callTrainer('update_params', {
+                a: parseInt(a),
+                b: parseInt(b)
             })
-            .then(response => response.json())
             .then(data => {
                 if (data.success) {
                     // 更新状态显示
                     document.querySelector('.status-display span').textContent = data.status;
+                    
+                    // 参数变化会改变插入位置，尚未选择时刷新预览
+                    const choiceBtn = document.querySelector('.choice-btn');
+                    if (choiceBtn && !choiceBtn.disabled) {
+                        loadPreview();
+                    }
                 }
             })
             .catch(error => {
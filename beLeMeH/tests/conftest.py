@@ -0,0 +1,79 @@
+# coding: utf-8
+"""测试公共设置：在临时目录中导入Web应用（独立的 SQLite 数据库和上传目录，不动 instance/db.sqlite）
+
+运行：
+    cd beLeMeH && python -m pytest -q tests
+"""
+
+import itertools
+import os
+import sys
+
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+_user_numbers = itertools.count(1)
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """导入后的 app 模块（整个测试会话共用一个）"""
+    workdir = tmp_path_factory.mktemp('app')
+    os.environ.update({
+        'SECRET_KEY': 'test-secret',
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{workdir / 'db.sqlite'}",
+        'PROGRESS_SHARD_FOLDER': str(workdir / 'shards'),
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',  # 测试中不需要真实的哈希代价
+        'JOB_WORKERS': '0',  # 任务由测试按需执行
+    })
+    os.chdir(workdir)  # 上传、导出目录是相对路径
+    import app
+    return app
+
+
+@pytest.fixture
+def make_deck(app_module):
+    """创建一个用户和一个词库文件，返回 (用户名, 用户id, 文件id)；密码都是 'p'"""
+    A = app_module
+
+    def make(words=30, username=None):
+        username = username or f'user{next(_user_numbers)}'
+        filepath = os.path.join(A.app.config['UPLOAD_FOLDER'], f'{username}_deck.txt')
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.writelines(f'w{i}\td{i}\n' for i in range(words))
+        with A.app.app_context():
+            user = A.User(username=username, password=A.hash_password('p'))
+            A.db.session.add(user)
+            A.db.session.flush()
+            file = A.VocabFile(filename='deck.txt', filepath=filepath, user_id=user.id, word_count=words)
+            A.db.session.add(file)
+            A.db.session.commit()
+            return username, user.id, file.id
+    return make
+
+
+@pytest.fixture
+def login(app_module):
+    """返回已登录的测试客户端"""
+    def login_as(username):
+        client = app_module.app.test_client()
+        response = client.post('/login', data={'username': username, 'password': 'p'})
+        assert response.status_code == 302
+        return client
+    return login_as
+
+
+@pytest.fixture(params=[0, 2], ids=['central', 'sharded'])
+def progress_shards(request, app_module, tmp_path, monkeypatch):
+    """进度存在主库，或按 PROGRESS_SHARDS=2 存在分片中（主库只在单词数变化时更新文件记录）"""
+    A = app_module
+    if request.param:
+        monkeypatch.setitem(A.app.config, 'PROGRESS_SHARDS', request.param)
+        monkeypatch.setitem(A.app.config, 'PROGRESS_SHARD_FOLDER', str(tmp_path / 'shards'))
+        A.init_progress_shards()
+    yield request.param
+    for engine in A.progress_shards['engines']:
+        engine.dispose()
+    A.progress_shards['engines'] = []
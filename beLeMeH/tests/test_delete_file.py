@@ -0,0 +1,57 @@
+# coding: utf-8
+"""删除文件后，正在学习该文件的训练器被清除，不会把进度写回（分片中也不留孤立的进度行）"""
+
+import pytest
+
+
+def stored_progress(A, file_id, user_id):
+    with A.app.app_context():
+        if A.sharded():
+            with A.shard_engine(user_id).connect() as conn:
+                return conn.execute(A.select(A.shard_progress.c.file_id)
+                                    .where(A.shard_progress.c.file_id == file_id)).first()
+        return A.db.session.get(A.VocabFile, file_id)
+
+
+@pytest.mark.parametrize('route', ['delete_file', 'delete_public'])
+def test_delete_clears_trainer_session(app_module, make_deck, login, progress_shards, route):
+    A = app_module
+    username, user_id, file_id = make_deck(words=5)
+    client = login(username)
+    assert client.post(f'/toggle_public/{file_id}').get_json()['is_public']
+    assert client.get(f'/select_file/{file_id}').status_code == 200
+    client.get('/next_word')
+    client.post('/process_choice', json={'choice': 'L'})
+    assert stored_progress(A, file_id, user_id) is not None
+
+    assert client.post(f'/{route}/{file_id}').get_json()['success']
+    assert user_id not in A.user_trainers
+    result = client.get('/next_word').get_json()
+    assert result == {'success': False, 'message': '训练器未初始化'}
+    assert stored_progress(A, file_id, user_id) is None
+
+
+def test_shared_deck_kept_while_referenced(app_module, make_deck, login):
+    A = app_module
+    owner, _, file_id = make_deck(words=5)
+    owner_client = login(owner)
+    assert owner_client.post(f'/toggle_public/{file_id}').get_json()['is_public']
+    assert owner_client.get(f'/select_file/{file_id}').status_code == 200
+    with A.app.app_context():
+        filepath = A.db.session.get(A.VocabFile, file_id).filepath
+    assert filepath in A._shared_decks
+
+    other, _, _ = make_deck(words=1)
+    other_client = login(other)
+    copy_id = other_client.post(f'/use_public/{file_id}').get_json()['file_id']
+
+    # 其他用户的副本仍引用该文件：缓存保留
+    assert owner_client.post(f'/delete_file/{file_id}').get_json()['success']
+    assert filepath in A._shared_decks
+    # 最后一个引用删除后，清理任务移除文件并清出缓存
+    assert other_client.post(f'/delete_file/{copy_id}').get_json()['success']
+    with A.app.app_context():
+        while A.run_next_job('test'):
+            pass
+    assert filepath not in A._shared_decks
+    assert not A.os.path.exists(filepath)
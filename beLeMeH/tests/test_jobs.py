@@ -0,0 +1,75 @@
+# coding: utf-8
+"""后台任务的租约：心跳过期才重新排队，租约丢失的工作线程不记录结果"""
+
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+
+
+@pytest.fixture
+def jobs(app_module, monkeypatch):
+    A = app_module
+    monkeypatch.setitem(A.app.config, 'JOB_HEARTBEAT_INTERVAL', 0.05)
+    monkeypatch.setitem(A.app.config, 'JOB_LEASE', 60)
+    monkeypatch.setitem(A._job_maintenance, 'next', float('inf'))  # 由测试显式调用 maintain_jobs
+    with A.app.app_context():
+        A.Job.query.delete()
+        A.db.session.commit()
+        yield A
+
+
+def claim(A, kind):
+    A.enqueue_job(kind)
+    job = A.claim_job('test')
+    assert job is not None and job.kind == kind
+    return job
+
+
+def test_only_stale_heartbeats_are_requeued(jobs):
+    A = jobs
+    old = A.utc_now() - timedelta(hours=1)
+    stale, alive = claim(A, 'stale'), claim(A, 'alive')
+    stale.started_at = stale.heartbeat_at = old
+    alive.started_at = old              # 执行了很久，但心跳是新的
+    A.db.session.commit()
+
+    A.maintain_jobs()
+    A.db.session.expire_all()
+    assert (stale.status, stale.claimed_by, stale.error) == ('queued', None, '心跳超时，工作进程可能已退出')
+    assert alive.status == 'running'
+
+
+def test_heartbeat_is_updated_while_job_runs(jobs, monkeypatch):
+    A = jobs
+    seen = []
+
+    def slow():
+        time.sleep(0.3)
+        A.db.session.expire_all()
+        job = A.Job.query.filter_by(kind='slow').one()
+        seen.append(job.heartbeat_at > job.started_at)
+        return {}
+
+    monkeypatch.setitem(A.JOB_HANDLERS, 'slow', slow)
+    A.enqueue_job('slow')
+    assert A.run_next_job('test')
+    assert seen == [True]
+    assert A.Job.query.filter_by(kind='slow').one().status == 'done'
+
+
+def test_worker_that_lost_its_lease_does_not_record_result(jobs, monkeypatch):
+    A = jobs
+
+    def requeued_meanwhile():
+        # 模拟心跳超时后其他进程把任务重新排队
+        A.db.session.execute(update(A.Job).where(A.Job.kind == 'lost').values(status='queued', claimed_by=None))
+        A.db.session.commit()
+        return {'stale': True}
+
+    monkeypatch.setitem(A.JOB_HANDLERS, 'lost', requeued_meanwhile)
+    A.enqueue_job('lost')
+    assert A.run_next_job('test')
+    job = A.Job.query.filter_by(kind='lost').one()
+    assert (job.status, job.result) == ('queued', None)
@@ -0,0 +1,45 @@
+# coding: utf-8
+"""登录、注册时密码计算排队已满：立即返回 503 和 Retry-After，不占着请求线程等待"""
+
+import threading
+import time
+
+
+def test_busy_password_pool_returns_503_immediately(app_module, make_deck, monkeypatch):
+    A = app_module
+    username, _, _ = make_deck(words=1)
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(A, '_password_slots', slots)
+    client = A.app.test_client()
+
+    slots.acquire()  # 唯一的名额被占用
+    try:
+        started = time.perf_counter()
+        response = client.post('/login', data={'username': username, 'password': 'p'})
+        assert time.perf_counter() - started < 1
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == str(A.app.config['PASSWORD_HASH_RETRY_AFTER'])
+
+        response = client.post('/register', data={'username': username + '-new', 'password': 'p'})
+        assert response.status_code == 503
+        assert 'Retry-After' in response.headers
+    finally:
+        slots.release()
+
+    response = client.post('/login', data={'username': username, 'password': 'p'})
+    assert response.status_code == 302
+
+
+def test_short_hash_method_does_not_rehash_every_login(app_module, make_deck, monkeypatch):
+    A = app_module
+    monkeypatch.setitem(A.app.config, 'PASSWORD_HASH_METHOD', 'pbkdf2')  # werkzeug 写入 pbkdf2:sha256:<默认迭代次数>
+    username, user_id, _ = make_deck(words=1)
+    client = A.app.test_client()
+
+    def stored_hash():
+        with A.app.app_context():
+            return A.db.session.get(A.User, user_id).password
+
+    first = stored_hash()
+    assert client.post('/login', data={'username': username, 'password': 'p'}).status_code == 302
+    assert stored_hash() == first
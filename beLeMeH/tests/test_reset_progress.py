@@ -0,0 +1,25 @@
+# coding: utf-8
+"""重置进度：返回重置后的第一个单词；词库为空时返回学习完成"""
+
+
+def test_reset_returns_first_word(app_module, make_deck, login):
+    username, _, file_id = make_deck(words=5)
+    client = login(username)
+    assert client.get(f'/select_file/{file_id}').status_code == 200
+    client.get('/next_word')
+    client.post('/process_choice', json={'choice': 'L'})
+    client.get('/next_word')
+
+    result = client.post('/reset_progress', json={}).get_json()
+    assert result['success']
+    assert result['word']['word'] == 'w0'
+
+
+def test_reset_empty_deck_returns_finished(app_module, make_deck, login):
+    username, _, file_id = make_deck(words=0)
+    client = login(username)
+    client.get(f'/select_file/{file_id}')
+
+    result = client.post('/reset_progress', json={}).get_json()
+    assert result['success'], result
+    assert result['word'] == app_module.finished_payload()
@@ -0,0 +1,57 @@
+# coding: utf-8
+"""schedule_sim.py 的批量排程与 VocabularyTrainer 的 deque 排程一致：
+固定随机种子模拟，再把每个会话的选择逐个交给 VocabularyTrainer，每一步的队首单词和最终队列都应相同"""
+
+import pytest
+
+import schedule_sim
+
+SESSIONS = 12
+REVIEWS = 2000
+
+
+def replay(A, deck_size, a, b, steps, session):
+    """按模拟中某个会话的选择驱动 VocabularyTrainer，返回 (各步队首单词, 最终队列, 最大插入位置)"""
+    trainer = A.VocabularyTrainer(a=a, b=b)
+    trainer.to_learn.extend(A.Vocabulary(str(i), '') for i in range(deck_size))
+    heads, max_insert = [], 0
+    for rows, words, choices in steps:
+        picked = (rows == session).nonzero()[0]
+        if picked.size == 0:
+            break
+        word_obj = trainer.get_next_word()
+        heads.append(int(word_obj.word))
+        choice = 'LMH'[choices[picked[0]]]
+        insert_index = trainer.calculate_insert_index(word_obj.tag, choice)
+        max_insert = max(max_insert, insert_index or 0)
+        trainer.process_choice(word_obj, choice)
+        trainer.answered = True
+    return heads, [int(word.word) for word in trainer.to_learn], max_insert
+
+
+def session_heads(steps, session):
+    heads = []
+    for rows, words, _ in steps:
+        picked = (rows == session).nonzero()[0]
+        if picked.size == 0:
+            break
+        heads.append(int(words[picked[0]]))
+    return heads
+
+
+# 小词库：插入位置经常超出队列长度被截断；大词库：连续H时插入位置超过 SMALL_SHIFT，走逐个会话整段移动
+@pytest.mark.parametrize('deck_size, a, b', [(30, 3, 8), (700, 5, 10)])
+def test_simulator_matches_trainer(app_module, deck_size, a, b):
+    A = app_module
+    model = schedule_sim.LearnerModel(known_ratio=0.3)
+    trace = {}
+    schedule_sim.simulate(deck_size, a, b, sessions=SESSIONS, reviews=REVIEWS, model=model, seed=7, trace=trace)
+
+    max_insert = 0
+    for session in range(SESSIONS):
+        heads, queue, session_max = replay(A, deck_size, a, b, trace['steps'], session)
+        assert heads == session_heads(trace['steps'], session)
+        assert queue == trace['queues'][session]
+        max_insert = max(max_insert, session_max)
+    if deck_size > schedule_sim.SMALL_SHIFT:
+        assert max_insert > schedule_sim.SMALL_SHIFT
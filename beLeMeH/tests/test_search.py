@@ -0,0 +1,129 @@
+# coding: utf-8
+"""全文检索：trigram 分词支持中文，短于3个字符的检索词逐行比较"""
+
+from sqlalchemy import text
+
+WORDS = [('学习', 'study'), ('中华人民共和国', "People's Republic of China"),
+         ('apple', '苹果，一种水果'), ('pineapple', '菠萝')]
+
+
+def index_deck(A, make_deck, words):
+    username, user_id, file_id = make_deck(words=1)
+    with A.app.app_context():
+        A.fts_index_words(file_id, [A.Vocabulary(word, definition) for word, definition in words])
+        A.db.session.commit()
+    return user_id, file_id
+
+
+def found(A, keywords, user_id):
+    with A.app.app_context():
+        return sorted(match['word'] for match in A.search_words(keywords, user_id, scope='mine'))
+
+
+def test_search_chinese_and_substrings(app_module, make_deck):
+    A = app_module
+    assert A.fts_state['available']
+    user_id, file_id = index_deck(A, make_deck, WORDS)
+
+    assert found(A, '学习', user_id) == ['学习']                # 两个汉字：逐行比较
+    assert found(A, '人民共和', user_id) == ['中华人民共和国']    # 走 trigram 索引
+    assert found(A, '水果', user_id) == ['apple']               # 释义中的中文
+    assert found(A, 'APPLE', user_id) == ['apple', 'pineapple']  # 子串匹配、不区分大小写
+    assert found(A, 'apple 水果', user_id) == ['apple']         # 长词和短词同时出现
+    assert found(A, '"', user_id) == []
+    assert found(A, '不存在的词', user_id) == []
+
+
+def test_file_keys_do_not_match_other_files(app_module, make_deck):
+    A = app_module
+    user_id, first_id = index_deck(A, make_deck, [('apple', 'a')])
+    _, second_id = index_deck(A, make_deck, [('apple', 'b')])
+    with A.app.app_context():
+        A.fts_copy_file(first_id, second_id)
+        A.fts_delete_file(first_id)
+        A.db.session.commit()
+        rows = A.db.session.execute(
+            text("SELECT CAST(file_id AS INTEGER) FROM vocab_fts WHERE vocab_fts MATCH :file"),
+            {'file': A.fts_file_query(second_id)}).scalars().all()
+    assert rows == [second_id, second_id]
+    assert found(A, 'apple', user_id) == []
+
+
+def test_old_unicode61_index_is_rebuilt(app_module, make_deck):
+    A = app_module
+    user_id, file_id = index_deck(A, make_deck, [])  # 词库文件中的单词是 w0
+    with A.app.app_context():
+        A.db.session.execute(text("DROP TABLE vocab_fts"))
+        A.db.session.execute(text(
+            "CREATE VIRTUAL TABLE vocab_fts USING fts5("
+            "word, definition, file_id, tokenize = 'unicode61 remove_diacritics 2')"))
+        A.db.session.commit()
+        A.ensure_search_index()
+        table_sql = A.db.session.execute(
+            text("SELECT sql FROM sqlite_master WHERE name = 'vocab_fts'")).scalar()
+    assert 'trigram' in table_sql
+    assert found(A, 'w0', user_id) == ['w0']
+
+
+def search_client(client, keywords):
+    result = client.get('/search', query_string={'q': keywords, 'scope': 'mine'}).get_json()
+    assert result['success']
+    return sorted(match['word'] for match in result['matches'])
+
+
+def test_undo_redo_updates_search_index(app_module, make_deck, login, progress_shards):
+    A = app_module
+    username, user_id, file_id = make_deck(words=5)
+    with A.app.app_context():
+        A.fts_index_words(file_id, [A.Vocabulary(f'w{i}', f'd{i}') for i in range(5)])
+        A.db.session.commit()
+    client = login(username)
+    assert client.get(f'/select_file/{file_id}').status_code == 200
+    assert client.get('/next_word').get_json()['word']['word'] == 'w0'
+
+    # 添加单词后撤销、重做
+    assert client.post('/add_word', json={'word': 'addedword', 'definition': 'x'}).get_json()['success']
+    assert search_client(client, 'addedword') == ['addedword']
+    assert client.get('/prev_word').get_json()['success']
+    assert search_client(client, 'addedword') == []
+    assert client.get('/redo_word').get_json()['success']
+    assert search_client(client, 'addedword') == ['addedword']
+    assert client.get('/prev_word').get_json()['success']
+
+    # 编辑当前单词后撤销、重做
+    assert client.post('/edit_word', json={'word': 'zebraword', 'definition': 'z'}).get_json()['success']
+    assert (search_client(client, 'zebraword'), search_client(client, 'w0')) == (['zebraword'], [])
+    assert client.get('/prev_word').get_json()['success']
+    assert (search_client(client, 'zebraword'), search_client(client, 'w0')) == ([], ['w0'])
+    assert client.get('/redo_word').get_json()['success']
+    assert (search_client(client, 'zebraword'), search_client(client, 'w0')) == (['zebraword'], [])
+
+
+def test_deck_answered_before_compile_job_is_indexed(app_module, make_deck, login, progress_shards):
+    A = app_module
+    username, user_id, file_id = make_deck(words=5)
+    with A.app.app_context():
+        A.enqueue_job('compile_deck', {'file_id': file_id}, user_id=user_id)  # 与上传时相同，任务尚未执行
+    client = login(username)
+    assert client.post(f'/toggle_public/{file_id}').get_json()['is_public']
+    assert client.get(f'/select_file/{file_id}').status_code == 200
+    assert client.get('/next_word').get_json()['word']['word'] == 'w0'
+    assert client.post('/edit_word', json={'word': 'zebraword', 'definition': 'z'}).get_json()['success']
+    client.post('/process_choice', json={'choice': 'L'})
+
+    # 源文件还没有索引时加入公共文件
+    other, _, _ = make_deck(words=1)
+    other_client = login(other)
+    assert other_client.post(f'/use_public/{file_id}').get_json()['success']
+
+    with A.app.app_context():
+        while A.run_next_job('test'):
+            pass
+    assert (search_client(client, 'zebraword'), search_client(client, 'w1')) == (['zebraword'], ['w1'])
+    assert (search_client(other_client, 'w0'), search_client(other_client, 'w1')) == (['w0'], ['w1'])
+
+    # 编译完成后加入的副本立即按原文件建立索引（不含所有者编辑过的单词）
+    third, _, _ = make_deck(words=1)
+    third_client = login(third)
+    assert third_client.post(f'/use_public/{file_id}').get_json()['success']
+    assert (search_client(third_client, 'w0'), search_client(third_client, 'zebraword')) == (['w0'], [])
@@ -0,0 +1,33 @@
+# coding: utf-8
+"""用 python app.py 启动时，spawn 进程池的子进程以 __mp_main__ 重新执行 app.py，不应执行建表等启动操作"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+
+from conftest import APP_DIR
+
+# 与 multiprocessing.spawn 在子进程中执行主脚本的方式相同（子进程此时已导入 multiprocessing）
+RUN_AS_POOL_CHILD = "import multiprocessing, runpy, sys; runpy.run_path(sys.argv[1], run_name=sys.argv[2])"
+
+
+def run_app_script(workdir, run_name):
+    db_path = workdir / 'db.sqlite'
+    env = dict(os.environ, SECRET_KEY='test-secret', SQLALCHEMY_DATABASE_URI=f'sqlite:///{db_path}',
+               PROGRESS_SHARD_FOLDER=str(workdir / 'shards'), JOB_WORKERS='0',
+               PYTHONPATH=APP_DIR)  # spawn 的子进程沿用父进程的 sys.path
+    subprocess.run([sys.executable, '-c', RUN_AS_POOL_CHILD, os.path.join(APP_DIR, 'app.py'), run_name],
+                   cwd=workdir, env=env, check=True, capture_output=True)
+    if not db_path.exists():
+        return []
+    with sqlite3.connect(db_path) as conn:
+        return [name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+
+
+def test_pool_child_skips_startup(tmp_path):
+    assert run_app_script(tmp_path, '__mp_main__') == []
+
+
+def test_imported_app_creates_schema(tmp_path):
+    assert 'vocab_file' in run_app_script(tmp_path, 'app')
@@ -0,0 +1,57 @@
+# coding: utf-8
+"""训练器接口的登录校验经 Flask-Login 完成：用户被删除后，手里的会话Cookie不再有效"""
+
+import asyncio
+import json
+
+
+def delete_user(A, user_id):
+    with A.app.app_context():
+        A.db.session.delete(A.db.session.get(A.User, user_id))
+        A.db.session.commit()
+
+
+def asgi_get(application, path, cookie):
+    """直接调用ASGI应用，返回 (状态码, JSON)"""
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'',
+             'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode('latin-1'))],
+             'client': ('127.0.0.1', 50000)}
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    return sent[0]['status'], json.loads(sent[1]['body'])
+
+
+def test_deleted_user_loses_trainer_access(app_module, make_deck, login):
+    A = app_module
+    username, user_id, file_id = make_deck(words=5)
+    client = login(username)
+    assert client.get(f'/select_file/{file_id}').status_code == 200
+    assert client.get('/next_word').get_json()['success']
+
+    delete_user(A, user_id)
+    response = client.get('/next_word')
+    assert response.status_code == 401
+    assert response.get_json()['message'] == '请先登录'
+
+
+def test_asgi_trainer_api_uses_flask_login(app_module, make_deck, login):
+    import asgi
+    A = app_module
+    username, user_id, file_id = make_deck(words=5)
+    client = login(username)
+    assert client.get(f'/select_file/{file_id}').status_code == 200
+    cookie = f"{A.app.config['SESSION_COOKIE_NAME']}={client.get_cookie(A.app.config['SESSION_COOKIE_NAME']).value}"
+
+    status, payload = asgi_get(asgi.application, '/next_word', cookie)
+    assert status == 200 and payload['success']
+
+    delete_user(A, user_id)
+    status, payload = asgi_get(asgi.application, '/next_word', cookie)
+    assert status == 401
@@ -0,0 +1,77 @@
+# coding: utf-8
+"""同一用户的并发请求：每次作答恰好改动一个单词，不丢失、不重复（见 trainer_lock）"""
+
+import json
+import sys
+import threading
+from collections import Counter
+
+THREADS = 8
+ROUNDS = 50
+
+
+def tag_letters(words):
+    return sum(len(word.tag) for word in words)
+
+
+def test_concurrent_choices_are_not_lost_or_duplicated(app_module, make_deck, login):
+    A = app_module
+    username, user_id, file_id = make_deck(words=30)
+    clients = [login(username) for _ in range(THREADS)]
+    assert clients[0].get(f'/select_file/{file_id}').status_code == 200
+    assert A.user_trainers[user_id]['file_id'] == file_id
+
+    answered = Counter()
+    errors = []
+    start = threading.Barrier(THREADS)
+
+    def worker(index, client):
+        start.wait()
+        for round_number in range(ROUNDS):
+            choice = 'LMH'[(index + round_number) % 3]
+            result = client.post('/process_choice', json={'choice': choice}).get_json()
+            # 另一个线程抢先作答时返回"当前单词已作答"，不算错误
+            if result['success']:
+                answered[threading.get_ident()] += 1
+            elif result['message'] != '当前单词已作答':
+                errors.append(result)
+            result = client.get('/next_word').get_json()
+            if not result['success']:
+                errors.append(result)
+
+    threads = [threading.Thread(target=worker, args=(i, client)) for i, client in enumerate(clients)]
+    # 频繁切换线程，让没有加锁的读-改-写几乎必然交错
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert errors == []
+    total_answers = sum(answered.values())
+    assert total_answers > 0
+
+    # 内存中的训练器：每个单词恰好出现一次，每次成功作答恰好给一个单词追加一个字母
+    trainer = A.user_trainers[user_id]['trainer']
+    words = trainer.all_words()
+    assert sorted(word.word for word in words) == sorted(f'w{i}' for i in range(30))
+    assert len({id(word) for word in words}) == 30
+    assert tag_letters(words) == total_answers
+
+    with A.app.app_context():
+        # 数据库中的进度与内存一致
+        file = A.db.session.get(A.VocabFile, file_id)
+        stored = A.VocabularyTrainer()
+        assert stored.load_progress(A.read_progress(file), file.filepath)
+        assert tag_letters(stored.all_words()) == total_answers
+        assert json.loads(A.read_progress(file))['to_learn'] == json.loads(trainer.save_progress())['to_learn']
+        assert (file.word_count, file.learned_count) == trainer.word_counts()
+
+        # 统计增量也不丢失、不重复
+        A.flush_trainer_stats(user_id)
+        stats = A.db.session.get(A.DeckStats, file_id)
+        assert stats.answers_l + stats.answers_m + stats.answers_h == total_answers